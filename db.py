@@ -1,7 +1,11 @@
 import asyncio
+from datetime import datetime
 from enum import Enum
+from typing import Optional
 
-from tortoise import Tortoise, fields, models
+from tortoise import Tortoise, connections, fields, models
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.functions import Count
 import os
 from dotenv import load_dotenv
 
@@ -10,10 +14,16 @@ load_dotenv()
 # Dynamically get the user's Desktop path
 desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
 db_folder = os.path.join(desktop_path, "wt-svs-discord-bot")
-os.makedirs(db_folder, exist_ok=True)  # Ensure the folder exists
 
 DB_FILE = os.path.join(db_folder, "wt_discord_bot_db.sqlite3")
 
+# Storage backend, DB_BACKEND: "sqlite" (single node, default) or "postgres".
+# SQLite uses DB_FILE unless the DB_FILE env var points elsewhere.
+# Postgres reads DB_HOST/DB_PORT/DB_USER/DB_PASSWORD/DB_NAME, the pool is sized with
+# DB_POOL_MIN_SIZE/DB_POOL_MAX_SIZE, and setting DB_REPLICA_HOST (+ DB_REPLICA_PORT)
+# routes the heavy read-only queries to a replica.
+READ_CONNECTION = "replica"
+
 
 class StatusEnum(str, Enum):
     ACTIVE = "ACTIVE"
@@ -74,43 +84,101 @@ class PlayerBattleLog(models.Model):
         table = "player_battle_log"
 
 
+def _postgres_credentials(prefix: str) -> dict:
+    return {
+        "host": os.getenv(f"{prefix}HOST"),
+        "port": int(os.getenv(f"{prefix}PORT", "5432").strip()),
+        "user": os.getenv("DB_USER"),
+        "password": os.getenv("DB_PASSWORD"),
+        "database": os.getenv("DB_NAME"),
+        "minsize": int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+        "maxsize": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        # asyncpg prepares every query it runs and keeps this many per connection, so the
+        # repeated read queries below skip re-planning; set to 0 behind pgbouncer
+        "statement_cache_size": int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100")),
+    }
+
+
+def get_tortoise_config() -> dict:
+    backend = os.getenv("DB_BACKEND", "sqlite").strip().lower()
+    if backend == "postgres":
+        db_connections = {
+            "default": {"engine": "tortoise.backends.asyncpg", "credentials": _postgres_credentials("DB_")},
+        }
+        if os.getenv("DB_REPLICA_HOST"):
+            db_connections[READ_CONNECTION] = {
+                "engine": "tortoise.backends.asyncpg",
+                "credentials": _postgres_credentials("DB_REPLICA_"),
+            }
+    elif backend == "sqlite":
+        db_file = os.getenv("DB_FILE", DB_FILE)
+        os.makedirs(os.path.dirname(db_file), exist_ok=True)  # Ensure the folder exists
+        db_connections = {"default": f"sqlite://{db_file}"}
+    else:
+        raise ValueError(f"Unsupported DB_BACKEND '{backend}', expected 'sqlite' or 'postgres'")
+
+    return {
+        "connections": db_connections,
+        "apps": {"models": {"models": ["db"], "default_connection": "default"}},
+    }
+
+
 async def init_db():
-    port = int(os.getenv("DB_PORT").strip())
-
-    await Tortoise.init(
-        db_url=(
-            f"postgres://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
-            f"@{os.getenv('DB_HOST')}:{port}/{os.getenv('DB_NAME')}"
-        ),
-        modules={"models": ["db"]}
-    )
+    await Tortoise.init(config=get_tortoise_config())
     await Tortoise.generate_schemas()
 
 
-# async def run():
-#     await init_db()
-#     print("✅ Database schema generated!")
-#     await Tortoise.close_connections()
+def read_db() -> BaseDBAsyncClient:
+    """Connection for read-only queries: the replica when configured, otherwise the primary.
+
+    A replica can lag behind the primary, so only use it for data that may be slightly stale.
+    """
+    alias = READ_CONNECTION if READ_CONNECTION in connections.db_config else "default"
+    return connections.get(alias)
+
+
+BATTLE_LOG_SUMMARY_FIELDS = ("map_name", "verdict", "enemy_squadron", "timestamp")
 
-async def run_sqlite_db():
-    # Step 1: Delete existing DB file if it exists
-    # if os.path.exists(DB_FILE):
-    #     os.remove(DB_FILE)
-    #     print("🗑️ Old database file deleted.")
 
-    # Step 2: Initialize Tortoise ORM with SQLite
-    await Tortoise.init(
-        db_url=f"sqlite://{DB_FILE}",
-        modules={"models": ["db"]},  # replace "db" with the actual module name of your models
+async def recent_battle_logs(squadron: Squadron, count: int) -> list[dict]:
+    """Latest `count` battle logs of the squadron, newest first."""
+    return await (
+        BattleLog.filter(squadron=squadron)
+        .using_db(read_db())
+        .order_by("-timestamp")
+        .limit(count)
+        .values(*BATTLE_LOG_SUMMARY_FIELDS)
     )
 
-    # Step 3: Generate schema (tables)
-    await Tortoise.generate_schemas()
-    print("✅ New SQLite database created.")
 
-    # Step 4: Close connections
-    await Tortoise.close_connections()
+async def battle_logs_since(squadron: Squadron, since: datetime) -> list[dict]:
+    return await (
+        BattleLog.filter(squadron=squadron, timestamp__gte=since)
+        .using_db(read_db())
+        .order_by("timestamp")
+        .values(*BATTLE_LOG_SUMMARY_FIELDS)
+    )
+
+
+async def battle_contributors(squadron: Squadron, since: Optional[datetime] = None) -> list[dict]:
+    """Battle count per squadron player, most battles first."""
+    query = PlayerBattleLog.filter(player__squadron=squadron)
+    if since is not None:
+        query = query.filter(battle_log__timestamp__gte=since)
+
+    return await (
+        query.using_db(read_db())
+        .annotate(battles=Count("id"))
+        .group_by("player_id", "player__player_name")
+        .order_by("-battles", "player_id")
+        .values("player__player_name", "battles")
+    )
 
 
 if __name__ == "__main__":
-    asyncio.run(run_sqlite_db())
+    async def run():
+        await init_db()
+        print("✅ Database schema generated!")
+        await Tortoise.close_connections()
+
+    asyncio.run(run())
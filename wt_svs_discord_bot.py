@@ -9,7 +9,8 @@ from discord import Embed
 from typing import Optional
 from datetime import datetime, timedelta, timezone
 
-from db import Squadron, StatusEnum, init_db, run_sqlite_db, SquadronSettings, BattleLog, SquadronPlayer, PlayerBattleLog
+from db import Squadron, StatusEnum, init_db, SquadronSettings, BattleLog, SquadronPlayer, PlayerBattleLog, \
+    read_db, recent_battle_logs, battle_logs_since, battle_contributors
 
 # Load environment variables
 load_dotenv()
@@ -19,8 +20,7 @@ api_key = os.getenv("API_KEY")
 class Client(commands.Bot):
     async def on_ready(self):
         print(f"Logged on as {self.user}!")
-        # await init_db()
-        await run_sqlite_db()
+        await init_db()
         try:
             guild = discord.Object(id=1372919660126671011)
             synced = await self.tree.sync(guild=guild)
@@ -296,14 +296,15 @@ async def show_recent_battle_log(interaction: discord.Interaction, count: Option
             await interaction.response.send_message("❌ No squadron is registered for this server.", ephemeral=True)
             return
 
-        logs = await BattleLog.filter(squadron=squadron).order_by('timestamp')
-        total_logs = len(logs)
+        total_logs = await BattleLog.filter(squadron=squadron).using_db(read_db()).count()
 
         if total_logs == 0:
             await interaction.response.send_message("📭 No battle logs found.")
             return
 
-        selected_logs = logs[:count]
+        # Fetched newest first, shown in chronological order
+        selected_logs = await recent_battle_logs(squadron, count if count is not None else total_logs)
+        selected_logs.reverse()
 
         embed = Embed(
             title=f"📚 Showing last {len(selected_logs)} of {total_logs} battle logs",
@@ -312,13 +313,13 @@ async def show_recent_battle_log(interaction: discord.Interaction, count: Option
 
         for i, log in enumerate(selected_logs, 1):
             # Choose emoji color based on verdict
-            verdict_emoji = "🟩" if log.verdict.upper() == "WIN" else "🟥"
+            verdict_emoji = "🟩" if log["verdict"].upper() == "WIN" else "🟥"
             # Build field value string
             field_value = (
-                f"{log.map_name}\n"
-                f"{log.timestamp.strftime('%b %d, %Y %H:%M UTC')}"
+                f"{log['map_name']}\n"
+                f"{log['timestamp'].strftime('%b %d, %Y %H:%M UTC')}"
             )
-            embed.add_field(name=f"{verdict_emoji} | Battle {i} | vs {log.enemy_squadron}", value=field_value,
+            embed.add_field(name=f"{verdict_emoji} | Battle {i} | vs {log['enemy_squadron']}", value=field_value,
                             inline=False)
             embed.add_field(name="\u200b", value="", inline=False)
 
@@ -340,7 +341,7 @@ async def show_todays_battle_log(interaction: discord.Interaction):
         now = datetime.now(timezone.utc)
         start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        logs = await BattleLog.filter(squadron=squadron, timestamp__gte=start_of_day).order_by('timestamp')
+        logs = await battle_logs_since(squadron, start_of_day)
         total_logs = len(logs)
 
         if total_logs == 0:
@@ -354,13 +355,13 @@ async def show_todays_battle_log(interaction: discord.Interaction):
 
         for i, log in enumerate(logs, 1):
             # Choose emoji color based on verdict
-            verdict_emoji = "🟩" if log.verdict.upper() == "WIN" else "🟥"
+            verdict_emoji = "🟩" if log["verdict"].upper() == "WIN" else "🟥"
             # Build field value string
             field_value = (
-                f"{log.map_name}\n"
-                f"{log.timestamp.strftime('%b %d, %Y %H:%M UTC')}"
+                f"{log['map_name']}\n"
+                f"{log['timestamp'].strftime('%b %d, %Y %H:%M UTC')}"
             )
-            embed.add_field(name=f"{verdict_emoji} | Battle {i} | vs {log.enemy_squadron}", value=field_value,
+            embed.add_field(name=f"{verdict_emoji} | Battle {i} | vs {log['enemy_squadron']}", value=field_value,
                             inline=False)
             embed.add_field(name="\u200b", value="", inline=False)
 
@@ -391,8 +392,8 @@ async def stats_most_battle_contributor(
             await interaction.response.send_message("❌ No squadron registered for this server.", ephemeral=True)
             return
 
-        players = await SquadronPlayer.filter(squadron=squadron)
-        if not players:
+        players_exist = await SquadronPlayer.filter(squadron=squadron).using_db(read_db()).exists()
+        if not players_exist:
             await interaction.response.send_message("❌ No players found in this squadron.", ephemeral=True)
             return
 
@@ -401,26 +402,15 @@ async def stats_most_battle_contributor(
         if days is not None and days > 0:
             recent_cutoff = datetime.now(timezone.utc) - timedelta(days=days)
 
-        player_battle_counts = []
-
-        for player in players:
-            if recent_cutoff:
-                count = await PlayerBattleLog.filter(
-                    player=player,
-                    battle_log__timestamp__gte=recent_cutoff
-                ).count()
-            else:
-                count = await PlayerBattleLog.filter(player=player).count()
-
-            if count > 0:
-                player_battle_counts.append((player.player_name, count))
+        # Rows come back ordered by battle count, busiest contributor first
+        rows = await battle_contributors(squadron, recent_cutoff)
+        player_battle_counts = [(row["player__player_name"], row["battles"]) for row in rows]
 
         if not player_battle_counts:
             await interaction.response.send_message("📭 No battle logs found for the specified period.", ephemeral=True)
             return
 
-        sorted_players = sorted(player_battle_counts, key=lambda x: x[1], reverse=True)
-        top_players = sorted_players[:top_n]
+        top_players = player_battle_counts[:top_n]
 
         leaderboard = "\n".join([
             f"🏅 **#{i + 1}** — 🧑 **{name}** | 🎯 Battles: `{count}`"